@@ -3,6 +3,20 @@ import os
 import lmdb
 import json
 import datetime
+import itertools
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+
+# Prefer orjson when installed: it encodes datetimes natively, in the same
+# isoformat() form as json_default, and returns bytes directly.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Files stored per write transaction. Bounding the transaction keeps LMDB's
+# dirty-page list, and so the cost of each commit, proportional to the batch.
+BATCH_SIZE = 512
 
 
 def parse_yaml_from_file(file_path: str):
@@ -19,13 +33,19 @@ def parse_yaml_from_file(file_path: str):
     # Initialize the YAML parser.
     # typ='safe' is crucial for security as it prevents arbitrary code execution
     # from untrusted YAML.
-    # pure=True forces the Python implementation.
-    yaml_parser = ruamel.yaml.YAML(typ="safe", pure=True)
+    # pure=False uses the C parser (ruamel.yaml.clib) when it is installed,
+    # while keeping ruamel's YAML 1.2 resolution, so e.g. an unquoted `yes`
+    # stays a string.
+    yaml_parser = ruamel.yaml.YAML(typ="safe", pure=False)
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            # The load() method parses the YAML from the file stream.
-            data = yaml_parser.load(f)
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None  # Empty document; mmap cannot map zero bytes.
+            # Map the file and hand the raw bytes to the loader, which detects
+            # the encoding itself; this skips the buffered text-mode copy.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = yaml_parser.load(mm)
         return data
     except FileNotFoundError:
         print(f"Error: File not found at path: {file_path}")
@@ -48,91 +68,149 @@ def parse_yaml_from_file(file_path: str):
         return None
 
 
+_DATETIME_TYPES = (datetime.datetime, datetime.date, datetime.time)
+
+
 def json_default(obj):
-    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+    if isinstance(obj, _DATETIME_TYPES):
         return obj.isoformat()
     return str(obj)
 
 
+def iter_tool_result_contents(parsed_data):
+    """Yield the file content of each tool_result in the user messages.
+
+    Lazy, so callers that only need the first match stop scanning there.
+    """
+    for message in parsed_data.get("messages", []):
+        if message.get("role") == "user" and message.get("content"):
+            for content_item in message["content"]:
+                if (
+                    isinstance(content_item, dict)
+                    and content_item.get("type") == "tool_result"
+                ):
+                    result_info = content_item.get("run", {}).get("result", {})
+                    if isinstance(result_info, dict):
+                        file_content = result_info.get("content")
+                        if file_content:
+                            yield file_content
+                    elif isinstance(result_info, list):
+                        print("result_info is a list; skipping content extraction.")
+
+
+def encode_value(data) -> bytes:
+    """Serialize parsed YAML data to UTF-8 JSON bytes for storage in LMDB.
+
+    Values stay JSON rather than a binary format such as msgpack because
+    lmdb-tui's preview pane pretty-prints JSON values.
+    """
+    if orjson is not None:
+        try:
+            # YAML mappings may have non-string keys; stdlib json stringifies them.
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # orjson rejects some values stdlib json accepts, such as integers
+            # beyond 64 bits; encode those documents with the fallback below.
+            pass
+    # Match orjson's compact UTF-8 output: no padding after separators and no
+    # \uXXXX escapes, so fewer bytes land in the map.
+    return json.dumps(
+        data, default=json_default, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
 # --- How to use the parser ---
 if __name__ == "__main__":
     conversations_dir = "conversations"
     yaml_files = [f for f in os.listdir(conversations_dir) if f.endswith(".yaml")]
     if not yaml_files:
         print(f"No YAML files found in {conversations_dir}")
+    # Import in LMDB's bytewise key order so every insert can be an append.
+    yaml_files.sort(key=lambda f: os.path.splitext(f)[0].encode("utf-8"))
 
-    # Open (or create) LMDB environment
-    lmdb_env = lmdb.open("conversations.lmdb", map_size=10**9)
-    with lmdb_env.begin(write=True) as txn:
-        for yaml_file in yaml_files:
-            yaml_file_path = os.path.join(conversations_dir, yaml_file)
-            parsed_data = parse_yaml_from_file(yaml_file_path)
-            print("\n--- Processing file: {} ---".format(yaml_file))
-            if parsed_data:
-                # Save to LMDB: key = file name without .yaml, value = JSON string
-                key = os.path.splitext(yaml_file)[0].encode("utf-8")
-                try:
-                    value = json.dumps(parsed_data, default=json_default).encode("utf-8")
-                except Exception as e:
-                    print(f"Failed to serialize {yaml_file} to JSON: {e}")
-                    continue
-                txn.put(key, value)
-                print(
-                    "Saved parsed data to LMDB with key: {}".format(key.decode("utf-8"))
-                )
-                # (Optional) Print summary as before
-                if isinstance(parsed_data, dict):
-                    print(f"ID: {parsed_data.get('id')}")
-                    messages = parsed_data.get("messages", [])
-                    if messages and isinstance(messages, list) and len(messages) > 0:
-                        first_message = messages[0]
-                        if isinstance(first_message, dict):
-                            print(
-                                "Role of first message: {}".format(
-                                    first_message.get("role")
-                                )
-                            )
-                            if first_message.get("role") == "user" and isinstance(
-                                first_message.get("content"), list
-                            ):
-                                content_item = first_message["content"][0]
-                                if (
-                                    isinstance(content_item, dict)
-                                    and "text" in content_item
-                                ):
+    # Open (or create) LMDB environment for a one-shot bulk import: commits
+    # skip fsync and syncing is deferred to a single flush at the end. An
+    # interrupted run may leave the database inconsistent, so simply re-run
+    # the import in that case. No writemap: it grows data.mdb to the full
+    # map size, and conversations.lmdb is tracked in git.
+    lmdb_env = lmdb.open(
+        "conversations.lmdb",
+        map_size=10**9,
+        metasync=False,
+        sync=False,
+    )
+    # YAML parsing is CPU-bound and independent per file, so it runs in worker
+    # processes; LMDB allows a single writer, so results are stored here, in
+    # batches of BATCH_SIZE, in key order.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        results = zip(
+            yaml_files,
+            pool.map(
+                parse_yaml_from_file,
+                [os.path.join(conversations_dir, f) for f in yaml_files],
+            ),
+        )
+        while batch := list(itertools.islice(results, BATCH_SIZE)):
+            with lmdb_env.begin(write=True) as txn, txn.cursor() as cursor:
+                for yaml_file, parsed_data in batch:
+                    yaml_file_path = os.path.join(conversations_dir, yaml_file)
+                    print("\n--- Processing file: {} ---".format(yaml_file))
+                    if parsed_data:
+                        # Save to LMDB: key = file name without .yaml, value = JSON string
+                        key = os.path.splitext(yaml_file)[0].encode("utf-8")
+                        try:
+                            value = encode_value(parsed_data)
+                        except Exception as e:
+                            print(f"Failed to serialize {yaml_file} to JSON: {e}")
+                            continue
+                        # Keys arrive sorted, so skip LMDB's B-tree search. The
+                        # append is refused (returns False) when the database
+                        # already holds this key or a later one, e.g. from a
+                        # previous import; overwrite it normally then.
+                        if not cursor.put(key, value, append=True):
+                            cursor.put(key, value)
+                        print(
+                            "Saved parsed data to LMDB with key: {}".format(key.decode("utf-8"))
+                        )
+                        # (Optional) Print summary as before
+                        if isinstance(parsed_data, dict):
+                            print(f"ID: {parsed_data.get('id')}")
+                            messages = parsed_data.get("messages", [])
+                            if messages and isinstance(messages, list) and len(messages) > 0:
+                                first_message = messages[0]
+                                if isinstance(first_message, dict):
                                     print(
-                                        "Text of first user message content: {}".format(
-                                            content_item["text"]
+                                        "Role of first message: {}".format(
+                                            first_message.get("role")
                                         )
                                     )
-                    tool_result_content_found = False
-                    for message in parsed_data.get("messages", []):
-                        if message.get("role") == "user" and message.get("content"):
-                            for content_item in message["content"]:
-                                if (
-                                    isinstance(content_item, dict)
-                                    and content_item.get("type") == "tool_result"
-                                ):
-                                    run_info = content_item.get("run", {})
-                                    result_info = run_info.get("result", {})
-                                    file_content = None
-                                    if isinstance(result_info, dict):
-                                        file_content = result_info.get("content")
-                                    elif isinstance(result_info, list):
-                                        print("result_info is a list; skipping content extraction.")
-                                    if file_content:
-                                        print(
-                                            "\n--- Found tool_result content (first 5 lines of TODO.md): ---"
-                                        )
-                                        print(
-                                            "\n".join(file_content.splitlines()[:5])
-                                        )
-                                        print(
-                                            "---------------------------------------------------------"
-                                        )
-                                        tool_result_content_found = True
-                                        break
-                            if tool_result_content_found:
-                                break
-            else:
-                print(f"Failed to parse YAML from file: {yaml_file_path}")
+                                    if first_message.get("role") == "user" and isinstance(
+                                        first_message.get("content"), list
+                                    ):
+                                        content_item = first_message["content"][0]
+                                        if (
+                                            isinstance(content_item, dict)
+                                            and "text" in content_item
+                                        ):
+                                            print(
+                                                "Text of first user message content: {}".format(
+                                                    content_item["text"]
+                                                )
+                                            )
+                            file_content = next(
+                                iter_tool_result_contents(parsed_data), None
+                            )
+                            if file_content:
+                                print(
+                                    "\n--- Found tool_result content (first 5 lines of TODO.md): ---"
+                                )
+                                print("\n".join(file_content.splitlines()[:5]))
+                                print(
+                                    "---------------------------------------------------------"
+                                )
+                    else:
+                        print(f"Failed to parse YAML from file: {yaml_file_path}")
+
+    # Flush the whole import to disk once, now that the writes are committed.
+    lmdb_env.sync(force=True)
+    lmdb_env.close()
@@ -10,12 +10,27 @@ import json
 import struct
 from pathlib import Path
 
+def open_env(path, map_size, max_dbs=0):
+    """Open an LMDB environment tuned for one-shot bulk creation.
+
+    Commits skip fsync; call close_env() to flush everything once at the end.
+    No writemap: it grows data.mdb to the full map size, and these files are
+    tracked fixtures.
+    """
+    return lmdb.open(str(path), max_dbs=max_dbs, map_size=map_size,
+                     metasync=False, sync=False)
+
+def close_env(env):
+    """Flush an environment opened with open_env() to disk and close it."""
+    env.sync(force=True)
+    env.close()
+
 def create_unnamed_database(path):
     """Create an LMDB with data in the unnamed database"""
     print(f"Creating unnamed database at: {path}")
     
     # Create environment
-    env = lmdb.open(str(path), max_dbs=0, map_size=10*1024*1024)  # 10MB
+    env = open_env(path, 10*1024*1024)  # 10MB
     
     with env.begin(write=True) as txn:
         # Add various types of data
@@ -25,7 +40,7 @@ def create_unnamed_database(path):
         txn.put(b'json_data', json.dumps({"test": "data"}).encode())
         txn.put(b'unicode_key', 'Hello 世界 🌍'.encode('utf-8'))
         
-    env.close()
+    close_env(env)
     print(f"✅ Created unnamed database with 5 entries")
 
 def create_named_databases(path):
@@ -33,7 +48,7 @@ def create_named_databases(path):
     print(f"Creating named databases at: {path}")
     
     # Create environment with space for named databases
-    env = lmdb.open(str(path), max_dbs=10, map_size=10*1024*1024)
+    env = open_env(path, 10*1024*1024, max_dbs=10)
     
     # Create multiple named databases
     with env.begin(write=True) as txn:
@@ -52,38 +67,43 @@ def create_named_databases(path):
         txn.put(b'2024-01-01', b'System started', db=logs_db)
         txn.put(b'2024-01-02', b'User logged in', db=logs_db)
     
-    env.close()
+    close_env(env)
     print(f"✅ Created 3 named databases: users, config, logs")
 
 def create_empty_database(path):
     """Create an empty LMDB environment"""
     print(f"Creating empty database at: {path}")
     
-    env = lmdb.open(str(path), max_dbs=0, map_size=1024*1024)  # 1MB
-    env.close()
+    env = open_env(path, 1024*1024)  # 1MB
+    close_env(env)
     print(f"✅ Created empty database")
 
 def create_large_database(path):
     """Create a larger database for performance testing"""
     print(f"Creating large database at: {path}")
     
-    env = lmdb.open(str(path), max_dbs=0, map_size=50*1024*1024)  # 50MB
+    env = open_env(path, 50*1024*1024)  # 50MB
     
-    with env.begin(write=True) as txn:
-        # Add 1000 entries
+    with env.begin(write=True) as txn, txn.cursor() as cursor:
+        # Add 1000 entries; keys are generated in sorted order, so append=True
+        # lets LMDB skip the B-tree search on every insert
+        padding = b'x' * 100  # ~100 byte values
         for i in range(1000):
-            key = f'key_{i:04d}'.encode()
-            value = f'value_{i:04d}_' + ('x' * 100)  # ~100 byte values
-            txn.put(key, value.encode())
+            key = b'key_%04d' % i
+            value = b'value_%04d_' % i + padding
+            # append=True returns False (MDB_KEYEXIST) when re-run over an
+            # existing database; overwrite so the fixture never goes stale
+            if not cursor.put(key, value, append=True):
+                cursor.put(key, value)
     
-    env.close()
+    close_env(env)
     print(f"✅ Created large database with 1000 entries")
 
 def create_mixed_database(path):
     """Create a database with both unnamed and named databases"""
     print(f"Creating mixed database at: {path}")
     
-    env = lmdb.open(str(path), max_dbs=5, map_size=10*1024*1024)
+    env = open_env(path, 10*1024*1024, max_dbs=5)
     
     with env.begin(write=True) as txn:
         # Add data to unnamed database
@@ -95,7 +115,7 @@ def create_mixed_database(path):
         txn.put(b'named_key1', b'named_value1', db=named_db)
         txn.put(b'named_key2', b'named_value2', db=named_db)
     
-    env.close()
+    close_env(env)
     print(f"✅ Created mixed database with unnamed and named data")
 
 def main():
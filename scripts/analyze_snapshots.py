@@ -7,121 +7,148 @@ analysis reports suitable for AI review and regression detection.
 """
 
 import json
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
 from datetime import datetime
 import argparse
 
+try:
+    import orjson
+except ImportError:  # Optional: much faster decoding when installed
+    orjson = None  # type: ignore[assignment]
+
+# Markers of characters the terminal could not render
+MISSING_CHARS_RE = re.compile(r'\?\?\?|□')
+
+
+def _load_snapshot(json_file: Path) -> Optional[Dict[str, Any]]:
+    """Load a single JSON snapshot, returning None if it cannot be read."""
+    try:
+        data = json_file.read_bytes()
+        snapshot: Dict[str, Any] = orjson.loads(data) if orjson else json.loads(data)
+        return snapshot
+    except Exception as e:
+        print(f"Warning: Could not load {json_file}: {e}")
+        return None
+
 
 def load_snapshots(snapshots_dir: Path) -> List[Dict[str, Any]]:
     """Load all JSON snapshots from the snapshots directory."""
-    snapshots = []
+    json_files = [
+        json_file for json_file in snapshots_dir.glob("*.json")
+        if not json_file.name.endswith("_report.json")  # Skip report files
+    ]
     
-    for json_file in snapshots_dir.glob("*.json"):
-        if json_file.name.endswith("_report.json"):
-            continue  # Skip report files
-            
-        try:
-            with open(json_file, 'r') as f:
-                snapshot = json.load(f)
-                snapshots.append(snapshot)
-        except Exception as e:
-            print(f"Warning: Could not load {json_file}: {e}")
-    
-    return sorted(snapshots, key=lambda x: x['timestamp'])
-
-
-def analyze_ui_consistency(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Analyze UI consistency across snapshots."""
-    analysis = {
-        "total_snapshots": len(snapshots),
-        "unique_dimensions": set(),
-        "views_tested": set(),
-        "state_transitions": [],
-        "potential_issues": []
-    }
+    # Overlap file reads and decoding across snapshots
+    with ThreadPoolExecutor() as executor:
+        snapshots = [
+            snapshot for snapshot in executor.map(_load_snapshot, json_files)
+            if snapshot is not None
+        ]
+    
+    return sorted(snapshots, key=itemgetter('timestamp'))
+
+
+def analyze_snapshots(snapshots: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Analyze UI consistency and performance patterns in a single walk."""
+    # Accumulate into locals; the analysis dicts are assembled at the end
+    total_snapshots = 0
+    unique_dimensions: Set[Tuple[int, ...]] = set()
+    views_tested: Set[str] = set()
+    state_transitions: List[Dict[str, Any]] = []
+    potential_issues: List[Dict[str, Any]] = []
+    prev_view: Optional[str] = None
+    
+    # Running content length statistics; min/max are seeded by the first snapshot
+    min_len = 0
+    max_len = 0
+    total_len = 0
+    query_snapshots: List[Dict[str, Any]] = []
     
-    prev_snapshot = None
     for snapshot in snapshots:
+        dims: Tuple[int, ...] = tuple(snapshot['dimensions'])
+        app_state: Dict[str, Any] = snapshot['app_state']
+        view: str = app_state['current_view']
+        content: str = snapshot['content']
+        content_len = len(content)
+        
         # Track dimensions
-        dims = tuple(snapshot['dimensions'])
-        analysis["unique_dimensions"].add(dims)
+        unique_dimensions.add(dims)
         
         # Track views
-        view = snapshot['app_state']['current_view']
-        analysis["views_tested"].add(view)
+        views_tested.add(view)
         
         # Track state transitions
-        if prev_snapshot:
-            prev_view = prev_snapshot['app_state']['current_view']
-            if prev_view != view:
-                analysis["state_transitions"].append({
-                    "from": prev_view,
-                    "to": view,
-                    "test": snapshot['test_name'],
-                    "description": snapshot['metadata'].get('description', 'unknown')
-                })
+        if total_snapshots and prev_view != view:
+            state_transitions.append({
+                "from": prev_view,
+                "to": view,
+                "test": snapshot['test_name'],
+                "description": snapshot['metadata'].get('description', 'unknown')
+            })
         
         # Check for potential issues
-        content = snapshot['content']
-        if '???' in content or '□' in content:
-            analysis["potential_issues"].append({
+        if MISSING_CHARS_RE.search(content):
+            potential_issues.append({
                 "type": "missing_characters",
                 "snapshot": snapshot['snapshot_id'],
                 "description": "Potential missing or unsupported characters"
             })
         
-        if len(content.split('\n')) != snapshot['dimensions'][1]:
-            analysis["potential_issues"].append({
+        if content.count('\n') + 1 != dims[1]:
+            potential_issues.append({
                 "type": "dimension_mismatch",
                 "snapshot": snapshot['snapshot_id'],
                 "description": "Content height doesn't match terminal height"
             })
-            
-        prev_snapshot = snapshot
-    
-    # Convert sets to lists for JSON serialization
-    analysis["unique_dimensions"] = list(analysis["unique_dimensions"])
-    analysis["views_tested"] = list(analysis["views_tested"])
-    
-    return analysis
-
-
-def analyze_performance_patterns(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Analyze performance and response patterns."""
-    analysis = {
-        "render_complexity": {},
-        "content_length_stats": {},
-        "query_response_patterns": []
-    }
-    
-    content_lengths = []
-    query_snapshots = []
-    
-    for snapshot in snapshots:
-        content_len = len(snapshot['content'])
-        content_lengths.append(content_len)
+        
+        # Content length statistics
+        if not total_snapshots or content_len < min_len:
+            min_len = content_len
+        if not total_snapshots or content_len > max_len:
+            max_len = content_len
+        total_len += content_len
         
         # Analyze query patterns
-        app_state = snapshot['app_state']
-        if app_state['current_view'] == 'Query':
+        if view == 'Query':
             query_snapshots.append({
                 "query": app_state['query'],
                 "result_count": app_state['entry_count'],
                 "content_length": content_len
             })
+            
+        prev_view = view
+        total_snapshots += 1
     
-    if content_lengths:
-        analysis["content_length_stats"] = {
-            "min": min(content_lengths),
-            "max": max(content_lengths),
-            "avg": sum(content_lengths) / len(content_lengths)
-        }
+    ui_consistency = {
+        "total_snapshots": total_snapshots,
+        # Convert sets to lists for JSON serialization
+        "unique_dimensions": list(unique_dimensions),
+        "views_tested": list(views_tested),
+        "state_transitions": state_transitions,
+        "potential_issues": potential_issues
+    }
     
-    analysis["query_response_patterns"] = query_snapshots
+    performance: Dict[str, Any] = {
+        "render_complexity": {},
+        "content_length_stats": {},
+        "query_response_patterns": query_snapshots
+    }
+    if total_snapshots:
+        performance["content_length_stats"] = {
+            "min": min_len,
+            "max": max_len,
+            "avg": total_len / total_snapshots
+        }
     
-    return analysis
+    return {
+        "ui_consistency": ui_consistency,
+        "performance": performance
+    }
 
 
 def generate_ai_analysis_prompt(analysis_results: Dict[str, Any]) -> str:
@@ -178,7 +205,7 @@ Focus on practical improvements that would enhance the user experience.
     return prompt
 
 
-def main():
+def main() -> None:
     parser = argparse.ArgumentParser(description="Analyze TUI test snapshots")
     parser.add_argument("--snapshots-dir", "-d", type=Path, default="test_snapshots",
                        help="Directory containing snapshot files")
@@ -186,6 +213,8 @@ def main():
                        help="Output file for analysis report")
     parser.add_argument("--ai-prompt", "-p", type=Path, default="ai_analysis_prompt.md",
                        help="Output file for AI analysis prompt")
+    parser.add_argument("--include-raw", action=argparse.BooleanOptionalAction, default=True,
+                       help="Embed the raw snapshots in the analysis report")
     
     args = parser.parse_args()
     
@@ -204,17 +233,21 @@ def main():
     print(f"📊 Found {len(snapshots)} snapshots to analyze")
     
     # Perform analysis
-    analysis_results = {
+    analysis_results: Dict[str, Any] = {
         "generated_at": datetime.now().isoformat(),
         "snapshots_analyzed": len(snapshots),
-        "ui_consistency": analyze_ui_consistency(snapshots),
-        "performance": analyze_performance_patterns(snapshots),
-        "raw_snapshots": snapshots  # Include for detailed AI analysis
+        **analyze_snapshots(snapshots),
     }
+    if args.include_raw:
+        analysis_results["raw_snapshots"] = snapshots  # Include for detailed AI analysis
     
     # Save analysis report
-    with open(args.output, 'w') as f:
-        json.dump(analysis_results, f, indent=2, default=str)
+    if orjson:
+        with open(args.output, 'wb') as f:
+            f.write(orjson.dumps(analysis_results, option=orjson.OPT_INDENT_2, default=str))
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(analysis_results, f, indent=2, default=str)
     print(f"💾 Analysis report saved to {args.output}")
     
     # Generate AI prompt
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 """Generate docs/llms.txt from Markdown sources."""
+import os
 import pathlib
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 DOCS = ROOT / "docs"
 
-pages = [p for p in DOCS.glob("*.md") if p.name != "llms.txt"]
+with os.scandir(DOCS) as entries:
+    pages = sorted(e.name for e in entries if e.name.endswith(".md"))
 
 lines = [
     "# lmdb-tui",
@@ -15,8 +17,8 @@ lines = [
     "## Documentation",
 ]
 
-for p in sorted(pages):
-    lines.append(f"- [{p.stem}]({p.name})")
+for name in pages:
+    lines.append(f"- [{os.path.splitext(name)[0]}]({name})")
 
 lines += [
     "",
@@ -4,6 +4,12 @@
 import json
 import pathlib
 import tomllib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 
@@ -33,8 +39,6 @@ formula = f"""class LmdbTui < Formula
 end
 """
 
-(dist / "lmdb-tui.rb").write_text(formula)
-
 manifest = {
     "version": version,
     "description": "Terminal UI for LMDB databases",
@@ -49,7 +53,17 @@ manifest = {
     }
 }
 
-(dist / "lmdb-tui.json").write_text(json.dumps(manifest, indent=2) + "\n")
+if orjson:
+    manifest_json = orjson.dumps(manifest, option=orjson.OPT_INDENT_2) + b"\n"
+else:
+    manifest_json = (json.dumps(manifest, indent=2) + "\n").encode()
+
+outputs = {
+    dist / "lmdb-tui.rb": formula.encode(),
+    dist / "lmdb-tui.json": manifest_json,
+}
+with ThreadPoolExecutor(max_workers=len(outputs)) as pool:
+    list(pool.map(pathlib.Path.write_bytes, outputs, outputs.values()))
 
 print("Manifests generated in", dist)
 